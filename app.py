@@ -1,4 +1,5 @@
 from app import app
 
+# Development server only; run serve.py in production.
 if __name__ == "__main__":
   app.run(host='0.0.0.0', port=5000, debug=False)
@@ -4,10 +4,15 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 import pymysql
 
+from app.config import CACHE_MAX_ENTRIES, CACHE_TTL, CACHE_REDIS_URL, JSON_PROVIDER
+from app.services.cache import ResponseCache
+from app.services.json_provider import init_json_provider
+
 pymysql.install_as_MySQLdb()
 
 app = Flask(__name__)
 CORS(app, origins="*", allow_headers="*")
+init_json_provider(app, JSON_PROVIDER)
 
 app.config['SQLALCHEMY_DATABASE_URI'] = 'mysql://root@localhost/filekit'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
@@ -16,6 +21,10 @@ db = SQLAlchemy(app)
 
 migrate = Migrate(app, db)
 
+cache = ResponseCache(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, redis_url=CACHE_REDIS_URL)
+
 from app.api.user import *
 # from app.api.template import *
-from app.api.file import *
\ No newline at end of file
+from app.api.file import *
+from app.api.cache import *
+from app.api.export import *
\ No newline at end of file
@@ -0,0 +1,7 @@
+from flask import jsonify
+
+from app import app, cache
+
+@app.route("/api/v1/admin/cache-stats", methods=["GET"])
+def get_cache_stats():
+    return jsonify(cache.stats()), 200
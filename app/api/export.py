@@ -0,0 +1,127 @@
+import os
+import io
+import csv
+import zipfile
+from datetime import date
+from flask import request, jsonify, Response, stream_with_context
+
+from app import app
+from app.config import EXPORT_BATCH_SIZE
+from app.models import File, User
+from app.api.user import USER_LISTING_FIELDS
+
+FILE_EXPORT_FIELDS = ("id", "name", "path", "created_at", "total_pages", "user_id")
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+ZIP_CHUNK_SIZE = 64 * 1024
+
+class ZipStream:
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+def iter_rows(model, fields):
+    # yield_per streams from a server-side cursor instead of loading the table into the session.
+    query = model.query.with_entities(*(getattr(model, field) for field in fields)).order_by(model.id)
+    return query.yield_per(EXPORT_BATCH_SIZE)
+
+def iter_ndjson(fields, rows):
+    batch = []
+    for row in rows:
+        batch.append(app.json.dumps(dict(zip(fields, row))))
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield "\n".join(batch) + "\n"
+            batch = []
+    if batch:
+        yield "\n".join(batch) + "\n"
+
+def csv_cell(value):
+    # Match the ISO 8601 datetimes app.json writes for NDJSON and the listings.
+    return value.isoformat() if isinstance(value, date) else value
+
+def iter_csv(fields, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([csv_cell(value) for value in row])
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+def export_response(model, fields, filename):
+    export_format = request.args.get("format", "ndjson")
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"msg": f"Unsupported export format: {export_format}"}), 400
+
+    encode = iter_ndjson if export_format == "ndjson" else iter_csv
+
+    return Response(
+        stream_with_context(encode(fields, iter_rows(model, fields))),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f"attachment; filename={filename}.{export_format}"}
+    )
+
+@app.route("/api/v1/admin/export/files", methods=["GET"])
+def export_files():
+    return export_response(File, FILE_EXPORT_FIELDS, "files")
+
+@app.route("/api/v1/admin/export/users", methods=["GET"])
+def export_users():
+    return export_response(User, USER_LISTING_FIELDS, "users")
+
+@app.route("/api/v1/admin/export/user-files/<int:user_id>", methods=["GET"])
+def export_user_files(user_id):
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({"msg": "User not found"}), 404
+
+    query = (
+        File.query.with_entities(File.name, File.path, File.created_at)
+        .filter(File.user_id == user_id)
+        .order_by(File.id)
+        .yield_per(EXPORT_BATCH_SIZE)
+    )
+
+    def generate():
+        stream = ZipStream()
+        with zipfile.ZipFile(stream, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, path, created_at in query:
+                if not os.path.exists(path):
+                    continue
+
+                entry = zipfile.ZipInfo(name, date_time=created_at.timetuple()[:6]) if created_at else zipfile.ZipInfo(name)
+                entry.compress_type = zipfile.ZIP_DEFLATED
+
+                with open(path, "rb") as source, archive.open(entry, mode="w", force_zip64=True) as target:
+                    for chunk in iter(lambda: source.read(ZIP_CHUNK_SIZE), b""):
+                        target.write(chunk)
+                        yield stream.drain()
+
+                yield stream.drain()
+
+        # Closing the archive writes the central directory.
+        yield stream.drain()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/zip",
+        headers={"Content-Disposition": f"attachment; filename=user_{user_id}_files.zip"}
+    )
@@ -1,143 +1,187 @@
 import os
-import pandas as pd
+import json
 import nest_asyncio
 import uuid
-from flask import request, jsonify, send_file
-from llama_index.core import VectorStoreIndex
-from llama_index.embeddings.openai import OpenAIEmbedding
-from llama_parse import LlamaParse
+from flask import request, jsonify, send_file, Response, stream_with_context
 from datetime import datetime
-from PyPDF2 import PdfReader
 
-from app.config import LLAMA_API_KEY, OPENAI_API_KEY
-from app.models import File
-from app import app, db
+from app.config import SCAN_PAGE_CHUNK_SIZE
+from app.models import File, User
+from app.services.blobs import store_bytes, release_blob, reclaim_blob, rollback_blobs
+from app.services.scan import count_pages, page_ranges, iter_scan, merge_tables, drop_repeated_headers
+from app import app, db, cache
 
 nest_asyncio.apply()
 
-@app.route("/api/v1/file/scan", methods=["POST"])
-def scan_file():
-    try:
-        if 'files' not in request.files:
-            return jsonify({"msg": "No files part in the request"}), 400
+cache.watch(File, "files")
 
-        files = request.files.getlist("files")
-        if not files:
-            return jsonify({"msg": "No files uploaded"}), 400
+FILE_LISTING_FIELDS = ("id", "name", "path", "created_at", "total_pages")
 
-        userId = request.form["userId"]
-        if not userId:
-            return jsonify({"msg": "UnAuthorized request"}), 401
+def save_uploaded_pdf(files):
+    uploaded_file_path = None
+    total_pages = 0
+    for file in files:
+        filename = file.filename
+        uploaded_file_path = os.path.abspath(f"./templates/{filename}")
+        file.save(uploaded_file_path)
 
-        uploaded_file_path = None
-        for file in files:
-            filename = file.filename
-            uploaded_file_path = os.path.abspath(f"./templates/{filename}")
-            file.save(uploaded_file_path)
+        total_pages = count_pages(uploaded_file_path)
 
-            pdf_reader = PdfReader(uploaded_file_path)
-            total_pages = len(pdf_reader.pages)
+    return uploaded_file_path, total_pages
 
-        if not uploaded_file_path:
-            return jsonify({"msg": "Failed to save uploaded file"}), 500
-
-        llama_parse = LlamaParse(
-            api_key=LLAMA_API_KEY,
-            language="en",
-            result_type="markdown",
-            parsing_instruction=(
-                "The provided file is an invoice containing supplier and program details, invoice numbers, and itemized purchase data. "
-                "Extract the following data in a structured format: "
-                "1. Supplier details: name, address, contact information. "
-                "2. Invoice details: invoice number, date, total amount, and program details (including program ID and description). "
-                "3. Itemized purchases: product name, brand, pack size, description, product ID, DID, UPC, quantities, total price, "
-                "FOB, DEL, program amount, and amount."
-                "Organize the data as a structured table for itemized purchases and a summary for totals. "
-                "Ensure all monetary values are captured accurately. Mathematical equations are not present and should be ignored. "
-                "Use plain markdown to format the output, with tables for structured data."
-            ),
-        )
+def scan_stages(uploaded_file_path, total_pages, user_id, page_chunk_size):
+    yield "page_count", {
+        "total_pages": total_pages,
+        "ranges": len(page_ranges(total_pages, page_chunk_size))
+    }
 
-        documents = llama_parse.load_data([uploaded_file_path])
+    dataframes = []
+    for event, payload in iter_scan(uploaded_file_path, total_pages, chunk_size=page_chunk_size):
+        if event == "tables":
+            dataframes.extend(payload["dataframes"])
+        yield event, payload
 
-        embedding = OpenAIEmbedding(openai_api_key=OPENAI_API_KEY)
+    combined_table = merge_tables(dataframes)
 
-        index = VectorStoreIndex.from_documents(documents, embed_model=embedding)
-        query_engine = index.as_query_engine()
+    unique_csv_name = f"output_invoice_data_{uuid.uuid4().hex}.csv"
 
-        response = query_engine.query(
-            str_or_query_bundle="Extract all itemized purchase data and totals as structured tables."
-        )
+    blob = store_bytes(combined_table.to_csv(index=False).encode("utf-8"))
+    output_csv_path = blob.path
 
-        markdown_content = str(response)
+    new_file = File(
+        name = unique_csv_name,
+        path = output_csv_path,
+        total_pages = total_pages,
+        user_id = user_id,
+        blob_id = blob.id
+    )
 
-        dataframes = []
-        for table in markdown_content.split("\n\n"):
-            if "|" in table:
-                rows = [row.strip().split("|") for row in table.split("\n") if "|" in row]
-                headers = [h.strip() for h in rows[0][1:-1]]
-                data = [row[1:-1] for row in rows[2:]]
+    db.session.add(new_file)
+    db.session.commit()
 
-                for row in data:
-                    if len(row) < len(headers):
-                        row.extend([""] * (len(headers) - len(row)))
+    # Only report once committed: the blob row stays locked until then, and a yield can block on the client.
+    yield "csv_written", {
+        "name": unique_csv_name,
+        "csv_path": output_csv_path,
+        "row_count": len(combined_table)
+    }
 
-                df = pd.DataFrame(data, columns=headers)
-                dataframes.append(df)
+    yield "file_created", {"file_id": new_file.id, "csv_path": output_csv_path}
 
-        combined_table = pd.concat(dataframes, ignore_index=True)
+def sse_event(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
 
-        unique_csv_name = f"output_invoice_data_{uuid.uuid4().hex}.csv"
-        output_csv_path = os.path.abspath(f"./templates/{unique_csv_name}")
+def remove_upload(uploaded_file_path):
+    if uploaded_file_path and os.path.exists(uploaded_file_path):
+        os.remove(uploaded_file_path)
 
-        combined_table.to_csv(output_csv_path, index=False)
+def receive_scan_upload():
+    if 'files' not in request.files:
+        return None, (jsonify({"msg": "No files part in the request"}), 400)
 
-        new_file = File(
-            name = unique_csv_name,
-            path = output_csv_path,
-            total_pages = total_pages,
-            user_id = userId
-        )
+    files = request.files.getlist("files")
+    if not files:
+        return None, (jsonify({"msg": "No files uploaded"}), 400)
+
+    userId = request.form.get("userId")
+    if not userId:
+        return None, (jsonify({"msg": "UnAuthorized request"}), 401)
+
+    uploaded_file_path = None
+    try:
+        uploaded_file_path, total_pages = save_uploaded_pdf(files)
+
+        if not uploaded_file_path:
+            return None, (jsonify({"msg": "Failed to save uploaded file"}), 500)
 
-        db.session.add(new_file)
-        db.session.commit()
+        page_chunk_size = request.form.get("pageChunkSize", type=int, default=SCAN_PAGE_CHUNK_SIZE)
 
-        if uploaded_file_path and os.path.exists(uploaded_file_path):
-            os.remove(uploaded_file_path)
+    except Exception as e:
+        remove_upload(uploaded_file_path)
+        return None, (jsonify({"msg": f"Error processing file: {str(e)}"}), 500)
+
+    return (uploaded_file_path, total_pages, userId, page_chunk_size), None
+
+@app.route("/api/v1/file/scan", methods=["POST"])
+def scan_file():
+    upload, error = receive_scan_upload()
+    if error:
+        return error
+
+    uploaded_file_path, total_pages, userId, page_chunk_size = upload
+    try:
+        output_csv_path = None
+        for event, payload in scan_stages(uploaded_file_path, total_pages, userId, page_chunk_size):
+            if event == "file_created":
+                output_csv_path = payload["csv_path"]
 
         return jsonify({"msg": "CSV created successfully.", "csv_path": output_csv_path}), 200
 
     except Exception as e:
-        if uploaded_file_path and os.path.exists(uploaded_file_path):
-            os.remove(uploaded_file_path)
+        rollback_blobs()
         return jsonify({"msg": f"Error processing file: {str(e)}"}), 500
 
+    finally:
+        remove_upload(uploaded_file_path)
+
+@app.route("/api/v1/file/scan/stream", methods=["POST"])
+def scan_file_stream():
+    upload, error = receive_scan_upload()
+    if error:
+        return error
+
+    uploaded_file_path, total_pages, userId, page_chunk_size = upload
+
+    def generate():
+        try:
+            yield sse_event("upload_saved", {"filename": os.path.basename(uploaded_file_path)})
+
+            for event, payload in scan_stages(uploaded_file_path, total_pages, userId, page_chunk_size):
+                if event == "tables":
+                    # Rows go out per range as soon as every earlier range is done, before the CSV is written.
+                    # Clean them the same way merge_tables does so the UI matches the saved CSV.
+                    for df in payload["dataframes"]:
+                        df = drop_repeated_headers(df)
+                        yield sse_event("rows", {
+                            "start": payload["start"],
+                            "end": payload["end"],
+                            "columns": list(df.columns),
+                            "rows": df.fillna("").values.tolist()
+                        })
+                else:
+                    yield sse_event(event, payload)
+
+            yield sse_event("done", {"msg": "CSV created successfully."})
+
+        except Exception as e:
+            rollback_blobs()
+            yield sse_event("error", {"msg": f"Error processing file: {str(e)}"})
+
+        finally:
+            remove_upload(uploaded_file_path)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.route("/api/v1/file/get-files", methods=["GET"])
+@cache.cached("files")
 def get_files():
     page = request.args.get('page', type=int, default=1)
     size = request.args.get('size', type=int, default=10)
     user_id = request.args.get('userId', type=int)
     try:
-        query = File.query
+        query = File.query.with_entities(File.id, File.name, File.path, File.created_at, File.total_pages)
         if user_id:
-            query = query.filter_by(user_id=user_id)
+            query = query.filter(File.user_id == user_id)
 
         paginated_files = query.paginate(page=page, per_page=size, error_out=False)
-        total_files_count = query.count()
-
-        file_list = []
-        for file in paginated_files.items:
-            file_list.append({
-                "id": file.id,
-                "name": file.name,
-                "path": file.path,
-                "created_at": file.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                "total_pages": file.total_pages,
-            })
 
         return jsonify({
-            "files": file_list,
-            "total_files_count": total_files_count,
+            "files": [dict(zip(FILE_LISTING_FIELDS, row)) for row in paginated_files.items],
+            "total_files_count": paginated_files.total,
             "current_page": paginated_files.page,
             "total_pages": paginated_files.pages,
             "message": "Files retrieved successfully"
@@ -149,32 +193,20 @@ def get_files():
         }), 500
 
 @app.route("/api/v1/file/get-all-files", methods=["GET"])
+@cache.cached("files", "users")
 def get_all_files():
     page = request.args.get('page', type=int, default=1)
     size = request.args.get('size', type=int, default=10)
     
     try:
-        query = File.query
+        # The listing has always reported the owner's name under "name".
+        query = File.query.join(User).with_entities(File.id, User.name, File.path, File.created_at, File.total_pages)
 
         paginated_files = query.paginate(page=page, per_page=size, error_out=False)
-        total_files_count = query.count()
-
-        file_list = []
-        for file in paginated_files.items:
-            user = file.user
-
-            file_list.append({
-                "id": file.id,
-                "name": file.name,
-                "path": file.path,
-                "created_at": file.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                "total_pages": file.total_pages,
-                "name": user.name
-            })
 
         return jsonify({
-            "files": file_list,
-            "total_files_count": total_files_count,
+            "files": [dict(zip(FILE_LISTING_FIELDS, row)) for row in paginated_files.items],
+            "total_files_count": paginated_files.total,
             "current_page": paginated_files.page,
             "total_pages": paginated_files.pages,
             "message": "Files retrieved successfully"
@@ -215,15 +247,23 @@ def delete_file(file_id):
         if not file:
             return jsonify({"msg": "File not found"}), 404
 
-        file_path = file.path
+        if file.blob_id:
+            reclaimed_digest = release_blob(file.blob_id)
+
+            db.session.delete(file)
+            db.session.commit()
 
-        if os.path.exists(file_path):
-            os.remove(file_path)
+            reclaim_blob(reclaimed_digest)
         else:
-            return jsonify({"msg": "File not found on the server"}), 404
+            file_path = file.path
+
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            else:
+                return jsonify({"msg": "File not found on the server"}), 404
 
-        db.session.delete(file)
-        db.session.commit()
+            db.session.delete(file)
+            db.session.commit()
 
         return jsonify({"msg": "File and its record have been deleted successfully"}), 200
 
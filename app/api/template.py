@@ -1,18 +1,23 @@
 import os
 
 from flask import request, jsonify
-from datetime import datetime
 
-from app import app, db
+from app import app, db, cache
 from app.models import Template
+from app.services.blobs import store_stream, rollback_blobs
+
+cache.watch(Template, "templates")
+
+TEMPLATE_LISTING_FIELDS = ("id", "name", "type", "size", "created_at")
 
 @app.route("/api/v1/admin/get-templates", methods=["GET"])
+@cache.cached("templates")
 def get_templates():
     search = request.args.get('search')
     page = request.args.get('page', type=int, default=1)
     size = request.args.get('size', type=int, default=10)
 
-    query = Template.query
+    query = Template.query.with_entities(*(getattr(Template, field) for field in TEMPLATE_LISTING_FIELDS))
 
     if search:
         query = query.filter(Template.name.ilike(f'%{search}%'))
@@ -24,7 +29,7 @@ def get_templates():
 
     response = {
         "total_count": total_count,
-        "templates": [template.to_dict() for template in filtered_templates]
+        "templates": [dict(zip(TEMPLATE_LISTING_FIELDS, row)) for row in filtered_templates]
     }
 
     return jsonify(response), 200
@@ -43,11 +48,6 @@ def add_template():
         saved_files = []
 
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            base_upload_folder = os.path.abspath("./uploads")
-            timestamped_folder = os.path.join(base_upload_folder, timestamp)
-            os.makedirs(timestamped_folder, exist_ok=True)
-
             for file in files:
                 if file.filename == '':
                     continue
@@ -56,18 +56,15 @@ def add_template():
                 file_name, file_extension = os.path.splitext(original_filename)
                 file_extension = file_extension.lstrip('.')
 
-                file_size = len(file.read())
-                file.seek(0)
-
-                file_path = os.path.join(timestamped_folder, original_filename)
-                file.save(file_path)
+                blob = store_stream(file.stream)
 
                 # Add to the database
                 new_template = Template(
                     name=file_name,
                     type=file_extension,
-                    size=file_size,
-                    path=file_path
+                    size=blob.size,
+                    path=blob.path,
+                    blob_id=blob.id
                 )
                 db.session.add(new_template)
 
@@ -75,7 +72,7 @@ def add_template():
                 saved_files.append({
                     "name": file_name,
                     "type": file_extension,
-                    "path": file_path
+                    "path": blob.path
                 })
 
             db.session.commit()
@@ -86,7 +83,7 @@ def add_template():
             }), 200
         except Exception as e:
             print(f"Database operation failed due to {e}")
-            db.session.rollback()
+            rollback_blobs()
             return jsonify({"msg": "Database Error", "error": str(e)}), 500
     else:
         return jsonify({"status": 400, "message": "Invalid request method"}), 400
\ No newline at end of file
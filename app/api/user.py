@@ -2,12 +2,16 @@ from flask import request, jsonify
 from datetime import datetime, timedelta
 from werkzeug.security import generate_password_hash, check_password_hash
 
-from app import app, db
+from app import app, db, cache
 from app.models import User
 from app.config import JWT_SECRET_KEY
 
 import jwt
 
+USER_LISTING_FIELDS = ("id", "name", "email", "role", "status")
+
+cache.watch(User, "users")
+
 @app.route("/api/v1/auth/signin", methods=["POST"])
 def signin():
     if (
@@ -83,13 +87,14 @@ def signup():
         return jsonify({"status": 400, "msg": "Missing fields"}), 400
     
 @app.route("/api/v1/users/get-users", methods=["GET"])
+@cache.cached("users")
 def get_users():
     search = request.args.get('search')
     status = request.args.get('status')
     page = request.args.get('page', type=int, default=1)
     size = request.args.get('size', type=int, default=10)
 
-    query = User.query
+    query = User.query.with_entities(*(getattr(User, field) for field in USER_LISTING_FIELDS))
 
     if search:
         query = query.filter(User.name.ilike(f'%{search}%') | User.email.ilike(f'%{search}%'))
@@ -107,7 +112,7 @@ def get_users():
 
     response = {
         "total_users_count": total_users_count,
-        "users": [user.to_dict() for user in filtered_users]
+        "users": [dict(zip(USER_LISTING_FIELDS, row)) for row in filtered_users]
     }
 
     return jsonify(response), 200
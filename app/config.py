@@ -6,4 +6,28 @@ load_dotenv()
 
 JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
 LLAMA_API_KEY = os.getenv('LLAMA_API_KEY')
-OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
\ No newline at end of file
+OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+
+SCAN_PAGE_CHUNK_SIZE = int(os.getenv('SCAN_PAGE_CHUNK_SIZE', 0))
+SCAN_MAX_WORKERS = int(os.getenv('SCAN_MAX_WORKERS', 4))
+SCAN_RANGE_RETRIES = int(os.getenv('SCAN_RANGE_RETRIES', 2))
+
+BLOB_STORAGE_DIR = os.path.abspath(os.getenv('BLOB_STORAGE_DIR', './blobs'))
+
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 1024))
+CACHE_TTL = int(os.getenv('CACHE_TTL', 300))
+CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL')
+
+JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'orjson')
+
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+
+SERVER_BIND = os.getenv('SERVER_BIND', '0.0.0.0:5000')
+SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', (os.cpu_count() or 1) * 2 + 1))
+SERVER_THREADS = int(os.getenv('SERVER_THREADS', 4))
+SERVER_TIMEOUT = int(os.getenv('SERVER_TIMEOUT', 300))
+SERVER_GRACEFUL_TIMEOUT = int(os.getenv('SERVER_GRACEFUL_TIMEOUT', 60))
+SERVER_KEEPALIVE = int(os.getenv('SERVER_KEEPALIVE', 5))
+SERVER_MAX_REQUESTS = int(os.getenv('SERVER_MAX_REQUESTS', 1000))
+SERVER_MAX_REQUESTS_JITTER = int(os.getenv('SERVER_MAX_REQUESTS_JITTER', 100))
+SERVER_PIDFILE = os.getenv('SERVER_PIDFILE')
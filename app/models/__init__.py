@@ -1,3 +1,4 @@
+from .blob import Blob
 from .user import User
 # from .template import Template
 from .file import File
\ No newline at end of file
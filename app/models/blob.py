@@ -0,0 +1,18 @@
+from app import db
+from datetime import datetime
+
+class Blob(db.Model):
+    __tablename__ = 'blobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    digest = db.Column(db.String(64), unique=True, nullable=False)
+    path = db.Column(db.String(512), nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __init__(self, digest, path, size, ref_count=1):
+        self.digest = digest
+        self.path = path
+        self.size = size
+        self.ref_count = ref_count
@@ -11,11 +11,14 @@ class File(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    blob_id = db.Column(db.Integer, db.ForeignKey('blobs.id'), nullable=True)
     
     user = db.relationship('User', backref='files')
+    blob = db.relationship('Blob')
 
-    def __init__(self, name, path, total_pages, user_id):
+    def __init__(self, name, path, total_pages, user_id, blob_id=None):
         self.name = name
         self.path = path
         self.total_pages = total_pages
         self.user_id = user_id
+        self.blob_id = blob_id
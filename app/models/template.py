@@ -10,6 +10,9 @@ class Template(db.Model):
     size = db.Column(db.Integer, nullable=False)
     path = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    blob_id = db.Column(db.Integer, db.ForeignKey('blobs.id'), nullable=True)
+
+    blob = db.relationship('Blob')
 
     def to_dict(self):
         return {
@@ -0,0 +1,121 @@
+import os
+import shutil
+import hashlib
+import tempfile
+from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import Session
+
+from app import db
+from app.config import BLOB_STORAGE_DIR
+from app.models import Blob
+
+CHUNK_SIZE = 1024 * 1024
+WRITTEN_BLOBS = "written_blobs"
+
+
+def blob_path(digest):
+    return os.path.join(BLOB_STORAGE_DIR, digest[:2], digest[2:4], digest)
+
+
+def write_blob_file(path, write):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+
+    # Write next to the final path and rename so readers never see a partial blob.
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            write(tmp_file)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def acquire_blob(digest, size, write):
+    # A single upsert takes the row lock whether the digest is new, shared or a tombstone,
+    # so concurrent stores of the same content queue up instead of racing or deadlocking.
+    blobs = Blob.__table__
+    db.session.execute(
+        mysql_insert(blobs)
+        .values(digest=digest, path=blob_path(digest), size=size, ref_count=1, created_at=datetime.utcnow())
+        .on_duplicate_key_update(ref_count=blobs.c.ref_count + 1)
+    )
+
+    blob = Blob.query.filter_by(digest=digest).populate_existing().with_for_update().one()
+
+    # ref_count 1 means a new row or a revived tombstone whose file may already be gone.
+    if blob.ref_count == 1 or not os.path.exists(blob.path):
+        write_blob_file(blob.path, write)
+        # Remembered until commit so rollback_blobs can undo the write.
+        db.session.info.setdefault(WRITTEN_BLOBS, set()).add(digest)
+
+    return blob
+
+
+def store_bytes(data):
+    digest = hashlib.sha256(data).hexdigest()
+    return acquire_blob(digest, len(data), lambda blob_file: blob_file.write(data))
+
+
+def store_stream(stream):
+    # Hash before writing so repeated content never touches the disk again.
+    hasher = hashlib.sha256()
+    size = 0
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+        hasher.update(chunk)
+        size += len(chunk)
+
+    def write(blob_file):
+        stream.seek(0)
+        shutil.copyfileobj(stream, blob_file, CHUNK_SIZE)
+
+    return acquire_blob(hasher.hexdigest(), size, write)
+
+
+def release_blob(blob_id):
+    blob = Blob.query.filter_by(id=blob_id).populate_existing().with_for_update().first()
+    if not blob:
+        return None
+
+    blob.ref_count -= 1
+    if blob.ref_count > 0:
+        return None
+
+    # The row stays behind as a tombstone; reclaim_blob removes the file once this is committed.
+    return blob.digest
+
+
+def reclaim_blob(digest):
+    if not digest:
+        return
+
+    try:
+        # Holding the row lock keeps acquire_blob from reviving the blob while the file is removed.
+        # With no row at all the locking read still blocks a concurrent first insert of this digest.
+        blob = Blob.query.filter_by(digest=digest).populate_existing().with_for_update().first()
+        path = blob.path if blob else blob_path(digest)
+        if (not blob or blob.ref_count <= 0) and os.path.exists(path):
+            os.remove(path)
+        db.session.commit()
+    except Exception as e:
+        # The owning record is already gone; a missed unlink only leaves a tombstone's file on disk.
+        print(f"Blob reclaim failed for {digest}: {e}")
+        db.session.rollback()
+
+
+def rollback_blobs():
+    # Files written for blobs in this transaction would otherwise outlive the rolled-back rows.
+    digests = db.session.info.pop(WRITTEN_BLOBS, set())
+    db.session.rollback()
+
+    for digest in digests:
+        reclaim_blob(digest)
+
+
+@event.listens_for(Session, "after_commit")
+def forget_written_blobs(session):
+    session.info.pop(WRITTEN_BLOBS, None)
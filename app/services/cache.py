@@ -0,0 +1,199 @@
+import os
+import time
+import zlib
+import threading
+import multiprocessing
+from collections import OrderedDict
+from functools import wraps
+from flask import request, make_response, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+GENERATION_SLOTS = 64
+
+
+class LRUBackend:
+    # Entries live in each process, but the generation counters sit in shared memory. Every
+    # worker forked after the cache is created (serve.py preloads the app) sees a write in any
+    # other worker and stops serving its stale entries. Processes started independently do not
+    # share counters and need the Redis backend.
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.generations = multiprocessing.Array("q", GENERATION_SLOTS)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def generation(self, namespace):
+        return self.generations[self._slot(namespace)]
+
+    def bump(self, namespace):
+        # Namespaces hash into fixed slots; a collision only invalidates a little more than needed.
+        with self.generations.get_lock():
+            self.generations[self._slot(namespace)] += 1
+
+    def _slot(self, namespace):
+        return zlib.crc32(namespace.encode("utf-8")) % GENERATION_SLOTS
+
+    def size(self):
+        return len(self.entries)
+
+
+class RedisBackend:
+    def __init__(self, url, ttl, prefix="filekit:cache:"):
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, value, ex=self.ttl)
+
+    def generation(self, namespace):
+        return int(self.client.get(f"{self.prefix}gen:{namespace}") or 0)
+
+    def bump(self, namespace):
+        self.client.incr(f"{self.prefix}gen:{namespace}")
+
+    def size(self):
+        return None
+
+
+class ResponseCache:
+    def __init__(self, max_entries=1024, ttl=300, redis_url=None):
+        if redis_url and redis is not None:
+            self.backend = RedisBackend(redis_url, ttl)
+        else:
+            if redis_url:
+                print("CACHE_REDIS_URL is set but redis is not installed; using the in-process cache")
+            self.backend = LRUBackend(max_entries, ttl)
+
+        self.stats_by_endpoint = {}
+        self.stats_lock = threading.Lock()
+        # Hit/miss totals shared by every worker forked from this process.
+        self.totals = multiprocessing.Array("q", 2)
+        self.pending_key = f"cache_invalidate_{id(self)}"
+
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_rollback", self._after_rollback)
+
+    def cached(self, *namespaces):
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                # Any backend failure degrades to an uncached call; a cache outage never fails a read.
+                key = self._call_backend("generation", self._make_key, request.endpoint, namespaces, kwargs)
+
+                body = self._call_backend("get", self.backend.get, key) if key else None
+                self._record(request.endpoint, body is not None)
+                if body is not None:
+                    return Response(body, status=200, mimetype="application/json")
+
+                response = make_response(view(*args, **kwargs))
+                if key and response.status_code == 200 and not response.is_streamed:
+                    self._call_backend("set", self.backend.set, key, response.get_data())
+
+                return response
+            return wrapper
+        return decorator
+
+    def watch(self, model, *namespaces):
+        def mark_dirty(mapper, connection, target):
+            session = object_session(target)
+            if session is not None:
+                session.info.setdefault(self.pending_key, set()).update(namespaces)
+
+        for event_name in ("after_insert", "after_update", "after_delete"):
+            event.listen(model, event_name, mark_dirty)
+
+    def invalidate(self, *namespaces):
+        # Runs after commit: raising here would report an already committed write as failed.
+        for namespace in namespaces:
+            self._call_backend("bump", self.backend.bump, namespace)
+
+    def stats(self):
+        with self.stats_lock:
+            endpoints = {
+                endpoint: {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0
+                }
+                for endpoint, (hits, misses) in self.stats_by_endpoint.items()
+            }
+
+        with self.totals.get_lock():
+            hits, misses = self.totals[0], self.totals[1]
+
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            # Entries and per-endpoint counters belong to the worker that served this request.
+            "worker": {
+                "pid": os.getpid(),
+                "entries": self.backend.size(),
+                "endpoints": endpoints
+            }
+        }
+
+    def _make_key(self, endpoint, namespaces, view_args):
+        generations = ",".join(f"{namespace}={self.backend.generation(namespace)}" for namespace in namespaces)
+        # Sort args so ?page=1&size=10 and ?size=10&page=1 share an entry.
+        params = "&".join(f"{name}={value}" for name, value in sorted(request.args.items(multi=True)))
+        route_args = "&".join(f"{name}={value}" for name, value in sorted(view_args.items()))
+        return f"{endpoint}|{generations}|{route_args}|{params}"
+
+    def _call_backend(self, operation, function, *args):
+        try:
+            return function(*args)
+        except Exception as e:
+            print(f"Response cache {operation} failed: {e}")
+            return None
+
+    def _record(self, endpoint, hit):
+        with self.stats_lock:
+            hits, misses = self.stats_by_endpoint.get(endpoint, (0, 0))
+            self.stats_by_endpoint[endpoint] = (hits + 1, misses) if hit else (hits, misses + 1)
+
+        with self.totals.get_lock():
+            self.totals[0 if hit else 1] += 1
+
+    def _after_commit(self, session):
+        namespaces = session.info.pop(self.pending_key, None)
+        if namespaces:
+            self.invalidate(*namespaces)
+
+    def _after_rollback(self, session):
+        session.info.pop(self.pending_key, None)
@@ -0,0 +1,50 @@
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def iso_default(o):
+    # Same ISO 8601 text orjson produces natively, so the wire format doesn't depend on the provider.
+    if isinstance(o, date):
+        return o.isoformat()
+    return DefaultJSONProvider.default(o)
+
+
+class IsoJSONProvider(DefaultJSONProvider):
+    default = staticmethod(iso_default)
+
+
+class OrjsonProvider(IsoJSONProvider):
+    option = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        # Callers asking for formatting orjson does not support get the stdlib encoder.
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self.option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.option),
+            mimetype=self.mimetype
+        )
+
+
+def init_json_provider(app, provider="orjson"):
+    if provider == "orjson" and orjson is not None:
+        app.json = OrjsonProvider(app)
+        return
+
+    if provider == "orjson":
+        print("JSON_PROVIDER is orjson but orjson is not installed; using the default provider")
+    app.json = IsoJSONProvider(app)
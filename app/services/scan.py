@@ -0,0 +1,201 @@
+import os
+import re
+import queue
+import shutil
+import tempfile
+import threading
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from llama_index.core import VectorStoreIndex
+from llama_index.embeddings.openai import OpenAIEmbedding
+from llama_parse import LlamaParse
+from PyPDF2 import PdfReader, PdfWriter
+
+from app.config import LLAMA_API_KEY, OPENAI_API_KEY, SCAN_MAX_WORKERS, SCAN_RANGE_RETRIES
+
+PARSING_INSTRUCTION = (
+    "The provided file is an invoice containing supplier and program details, invoice numbers, and itemized purchase data. "
+    "Extract the following data in a structured format: "
+    "1. Supplier details: name, address, contact information. "
+    "2. Invoice details: invoice number, date, total amount, and program details (including program ID and description). "
+    "3. Itemized purchases: product name, brand, pack size, description, product ID, DID, UPC, quantities, total price, "
+    "FOB, DEL, program amount, and amount."
+    "Organize the data as a structured table for itemized purchases and a summary for totals. "
+    "Ensure all monetary values are captured accurately. Mathematical equations are not present and should be ignored. "
+    "Use plain markdown to format the output, with tables for structured data."
+)
+
+EXTRACTION_QUERY = "Extract all itemized purchase data and totals as structured tables."
+
+SEPARATOR_CELL = re.compile(r"^:?-{2,}:?$")
+
+
+class PageRangeError(Exception):
+    def __init__(self, start, end, error):
+        super().__init__(f"Pages {start}-{end} failed: {error}")
+        self.start = start
+        self.end = end
+        self.error = error
+
+
+def count_pages(pdf_path):
+    return len(PdfReader(pdf_path).pages)
+
+
+def page_ranges(total_pages, chunk_size):
+    if not chunk_size or chunk_size <= 0 or total_pages <= chunk_size:
+        return [(1, total_pages)]
+    return [
+        (start, min(start + chunk_size - 1, total_pages))
+        for start in range(1, total_pages + 1, chunk_size)
+    ]
+
+
+def split_pdf(pdf_path, ranges, output_dir):
+    reader = PdfReader(pdf_path)
+    base_name = os.path.splitext(os.path.basename(pdf_path))[0]
+
+    range_paths = []
+    for start, end in ranges:
+        writer = PdfWriter()
+        for page_number in range(start - 1, end):
+            writer.add_page(reader.pages[page_number])
+
+        range_path = os.path.join(output_dir, f"{base_name}_p{start}-{end}.pdf")
+        with open(range_path, "wb") as range_file:
+            writer.write(range_file)
+        range_paths.append(range_path)
+
+    return range_paths
+
+
+def parse_documents(pdf_path):
+    llama_parse = LlamaParse(
+        api_key=LLAMA_API_KEY,
+        language="en",
+        result_type="markdown",
+        parsing_instruction=PARSING_INSTRUCTION,
+    )
+
+    return llama_parse.load_data([pdf_path])
+
+
+def query_markdown(documents):
+    embedding = OpenAIEmbedding(openai_api_key=OPENAI_API_KEY)
+
+    index = VectorStoreIndex.from_documents(documents, embed_model=embedding)
+    query_engine = index.as_query_engine()
+
+    response = query_engine.query(str_or_query_bundle=EXTRACTION_QUERY)
+
+    return str(response)
+
+
+def markdown_to_dataframes(markdown_content):
+    dataframes = []
+    for table in markdown_content.split("\n\n"):
+        if "|" in table:
+            rows = [row.strip().split("|") for row in table.split("\n") if "|" in row]
+            headers = [h.strip() for h in rows[0][1:-1]]
+            data = [row[1:-1] for row in rows[2:]]
+
+            for row in data:
+                if len(row) < len(headers):
+                    row.extend([""] * (len(headers) - len(row)))
+
+            df = pd.DataFrame(data, columns=headers)
+            dataframes.append(df)
+
+    return dataframes
+
+
+def drop_repeated_headers(table):
+    headers = [str(column).strip() for column in table.columns]
+
+    def is_repeated(row):
+        cells = ["" if pd.isna(cell) else str(cell).strip() for cell in row]
+        if cells == headers:
+            return True
+        filled = [cell for cell in cells if cell]
+        return bool(filled) and all(SEPARATOR_CELL.match(cell) for cell in filled)
+
+    mask = table.apply(is_repeated, axis=1)
+    return table[~mask].reset_index(drop=True)
+
+
+def merge_tables(dataframes):
+    combined_table = pd.concat(dataframes, ignore_index=True)
+    return drop_repeated_headers(combined_table)
+
+
+def extract_range(pdf_path, start, end, retries=SCAN_RANGE_RETRIES, emit=None, cancelled=None):
+    emit = emit or (lambda event, payload: None)
+    cancelled = cancelled or threading.Event()
+    attempt = 0
+    while True:
+        try:
+            emit("parse_started", {"start": start, "end": end, "attempt": attempt + 1})
+            documents = parse_documents(pdf_path)
+            emit("parse_finished", {"start": start, "end": end, "attempt": attempt + 1})
+
+            dataframes = markdown_to_dataframes(query_markdown(documents))
+            emit("extraction", {"start": start, "end": end, "tables": len(dataframes)})
+            return dataframes
+        except Exception as e:
+            if attempt >= retries or cancelled.is_set():
+                raise PageRangeError(start, end, e) from e
+            attempt += 1
+            # Wake up early if another range has already failed the scan.
+            if cancelled.wait(2 ** attempt):
+                raise PageRangeError(start, end, e) from e
+
+
+def iter_scan(pdf_path, total_pages, chunk_size=0, max_workers=SCAN_MAX_WORKERS):
+    ranges = page_ranges(total_pages, chunk_size)
+    events = queue.Queue()
+
+    cancelled = threading.Event()
+    executor = None
+
+    work_dir = tempfile.mkdtemp(prefix="scan_")
+    try:
+        if len(ranges) == 1:
+            range_paths = [pdf_path]
+        else:
+            range_paths = split_pdf(pdf_path, ranges, work_dir)
+
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(ranges))))
+        futures = []
+        for index, (range_path, (start, end)) in enumerate(zip(range_paths, ranges)):
+            future = executor.submit(
+                extract_range, range_path, start, end,
+                emit=lambda *event: events.put(event), cancelled=cancelled
+            )
+            future.add_done_callback(lambda _, index=index: events.put(("_done", index)))
+            futures.append(future)
+
+        finished = set()
+        next_index = 0
+        while next_index < len(futures):
+            event, payload = events.get()
+            if event != "_done":
+                yield event, payload
+                continue
+
+            # A range that ran out of retries fails the scan now, not when its turn comes.
+            error = futures[payload].exception()
+            if error is not None:
+                raise error
+
+            # Ranges can finish out of order; hold them back until every earlier range is out.
+            finished.add(payload)
+            while next_index in finished:
+                start, end = ranges[next_index]
+                yield "tables", {"start": start, "end": end, "dataframes": futures[next_index].result()}
+                next_index += 1
+    finally:
+        # Don't wait on ranges still in flight; queued ones are dropped and retrying ones give up.
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        cancelled.set()
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,61 @@
+import json
+import timeit
+from datetime import datetime, timedelta
+
+import orjson
+
+ROW_COUNTS = (500, 1000, 10000)
+REPEAT = 5
+FILE_LISTING_FIELDS = ("id", "name", "path", "created_at", "total_pages")
+
+
+class FileRow:
+    def __init__(self, id, name, path, created_at, total_pages):
+        self.id = id
+        self.name = name
+        self.path = path
+        self.created_at = created_at
+        self.total_pages = total_pages
+
+
+def make_rows(count):
+    start = datetime(2024, 12, 1, 19, 57, 50)
+    return [
+        (i, f"output_invoice_data_{i:032x}.csv", f"/srv/filekit/blobs/ab/cd/{i:064x}", start + timedelta(minutes=i), i % 40 + 1)
+        for i in range(count)
+    ]
+
+
+def current_path(objects):
+    # ORM objects -> dict per row with strftime -> stdlib json, as Flask's default provider does.
+    file_list = []
+    for file in objects:
+        file_list.append({
+            "id": file.id,
+            "name": file.name,
+            "path": file.path,
+            "created_at": file.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "total_pages": file.total_pages,
+        })
+    return json.dumps({"files": file_list}, ensure_ascii=True, sort_keys=True).encode("utf-8")
+
+
+def fast_path(rows):
+    return orjson.dumps({"files": [dict(zip(FILE_LISTING_FIELDS, row)) for row in rows]})
+
+
+def main():
+    print(f"{'rows':>6} {'current (ms)':>14} {'fast (ms)':>11} {'speedup':>8}")
+    for count in ROW_COUNTS:
+        rows = make_rows(count)
+        objects = [FileRow(*row) for row in rows]
+        number = max(1, 20000 // count)
+
+        current = min(timeit.repeat(lambda: current_path(objects), number=number, repeat=REPEAT)) / number
+        fast = min(timeit.repeat(lambda: fast_path(rows), number=number, repeat=REPEAT)) / number
+
+        print(f"{count:>6} {current * 1000:>14.3f} {fast * 1000:>11.3f} {current / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
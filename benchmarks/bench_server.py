@@ -0,0 +1,157 @@
+# Throughput of serve.py across worker/thread configurations under a mixed workload.
+#
+#   python benchmarks/bench_server.py --email admin@example.com --password secret [--scan-pdf invoice.pdf]
+#
+# Needs the database from app/__init__.py and an active user. Each configuration starts its own
+# server, warms up, then runs --duration seconds of signin / listing (/ scan) requests.
+# Listings pick random pages (1..--pages) and sizes. With --cache both (the default) every
+# configuration also runs with the response cache disabled, so the listing path itself is measured.
+import os
+import sys
+import time
+import uuid
+import random
+import argparse
+import subprocess
+import statistics
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIGS = [(1, 1), (2, 1), (4, 1), (2, 4), (4, 4), (8, 2)]
+PAGE_SIZES = (10, 25, 50, 100)
+
+
+def request(url, data=None, headers=None):
+    req = urllib.request.Request(url, data=data, headers=headers or {})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=600) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, time.perf_counter() - started
+
+
+def multipart(fields, file_field, file_path):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    with open(file_path, "rb") as pdf:
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; '
+            f'filename="{os.path.basename(file_path)}"\r\nContent-Type: application/pdf\r\n\r\n'.encode()
+            + pdf.read() + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+
+
+def make_workload(base_url, args):
+    signin_body = urllib.parse.urlencode({"email": args.email, "password": args.password}).encode()
+
+    def listing(path):
+        return lambda: request(f"{base_url}{path}?page={random.randint(1, args.pages)}&size={random.choice(PAGE_SIZES)}")
+
+    operations = [
+        ("signin", 0.3, lambda: request(f"{base_url}/api/v1/auth/signin", signin_body)),
+        ("get-users", 0.2, listing("/api/v1/users/get-users")),
+        ("get-files", 0.25, listing("/api/v1/file/get-files")),
+        ("get-all-files", 0.25, listing("/api/v1/file/get-all-files")),
+    ]
+    if args.scan_pdf:
+        scan_body, scan_headers = multipart({"userId": args.user_id}, "files", args.scan_pdf)
+        operations.append(("scan", args.scan_weight, lambda: request(f"{base_url}/api/v1/file/scan", scan_body, scan_headers)))
+    return operations
+
+
+def run_load(operations, clients, duration):
+    names = [name for name, _, _ in operations]
+    weights = [weight for _, weight, _ in operations]
+    calls = dict((name, call) for name, _, call in operations)
+    deadline = time.monotonic() + duration
+
+    def client():
+        results = []
+        while time.monotonic() < deadline:
+            name = random.choices(names, weights)[0]
+            status, elapsed = calls[name]()
+            results.append((name, status, elapsed))
+        return results
+
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        return [result for future in [executor.submit(client) for _ in range(clients)] for result in future.result()]
+
+
+def wait_until_up(base_url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            request(f"{base_url}/api/v1/admin/cache-stats")
+            return
+        except OSError:
+            time.sleep(0.5)
+    raise RuntimeError("server did not start")
+
+
+def bench_config(workers, threads, cache, args):
+    port = args.port
+    base_url = f"http://127.0.0.1:{port}"
+    env = dict(os.environ, SERVER_BIND=f"127.0.0.1:{port}", SERVER_WORKERS=str(workers), SERVER_THREADS=str(threads))
+    if not cache:
+        # A zero-entry in-process cache stores nothing, so every listing hits MySQL.
+        env.update(CACHE_MAX_ENTRIES="0", CACHE_REDIS_URL="")
+    server = subprocess.Popen([sys.executable, "serve.py"], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_up(base_url)
+        operations = make_workload(base_url, args)
+        run_load(operations, args.clients, args.warmup)
+        results = run_load(operations, args.clients, args.duration)
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies = sorted(elapsed for _, _, elapsed in results)
+    errors = sum(1 for _, status, _ in results if status >= 500)
+    return {
+        "rps": len(results) / args.duration,
+        "p50": statistics.median(latencies) * 1000 if latencies else 0,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--user-id", default="1")
+    parser.add_argument("--scan-pdf")
+    parser.add_argument("--scan-weight", type=float, default=0.02)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--cache", choices=("on", "off", "both"), default="both")
+    args = parser.parse_args()
+
+    cache_modes = {"on": (True,), "off": (False,), "both": (True, False)}[args.cache]
+
+    print(f"{'workers':>7} {'threads':>7} {'cache':>5} {'req/s':>9} {'p50 (ms)':>9} {'p99 (ms)':>9} {'5xx':>5}")
+    for workers, threads in CONFIGS:
+        for cache in cache_modes:
+            result = bench_config(workers, threads, cache, args)
+            print(
+                f"{workers:>7} {threads:>7} {'on' if cache else 'off':>5} {result['rps']:>9.1f} "
+                f"{result['p50']:>9.1f} {result['p99']:>9.1f} {result['errors']:>5}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# Production entry point: a pre-forking gunicorn server around the Flask app.
+#
+#   python serve.py
+#
+# Tune with SERVER_* variables (see app/config.py). With a pidfile set,
+#   kill -HUP $(cat $SERVER_PIDFILE)   gracefully replaces the workers;
+#   kill -USR2 $(cat $SERVER_PIDFILE)  starts a new master with new code, then TERM the old one.
+# HUP alone does not pick up code changes because the app is preloaded in the master.
+#
+# Without CACHE_REDIS_URL the response cache is in-process: each worker holds its own entries,
+# and only invalidation is shared (through memory created before the fork). Preloading is what
+# makes that work, so keep preload_app on, or set CACHE_REDIS_URL to share the entries as well.
+from gunicorn.app.base import BaseApplication
+
+from app import app, db
+from app.config import (
+    SERVER_BIND, SERVER_WORKERS, SERVER_THREADS, SERVER_TIMEOUT, SERVER_GRACEFUL_TIMEOUT,
+    SERVER_KEEPALIVE, SERVER_MAX_REQUESTS, SERVER_MAX_REQUESTS_JITTER, SERVER_PIDFILE,
+    CACHE_REDIS_URL
+)
+
+def warn_about_cache():
+    if SERVER_WORKERS > 1 and not CACHE_REDIS_URL:
+        print(
+            f"Warning: {SERVER_WORKERS} workers with the in-process response cache. Every worker keeps its own "
+            "entries and per-endpoint stats; set CACHE_REDIS_URL to share them."
+        )
+
+def post_fork(server, worker):
+    # Connections opened by the master must not be shared with the forked workers.
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+class Server(BaseApplication):
+    def __init__(self, application, options):
+        self.application = application
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
+
+def server_options():
+    return {
+        "bind": SERVER_BIND,
+        "workers": SERVER_WORKERS,
+        "threads": SERVER_THREADS,
+        "worker_class": "gthread" if SERVER_THREADS > 1 else "sync",
+        "preload_app": True,
+        "timeout": SERVER_TIMEOUT,
+        "graceful_timeout": SERVER_GRACEFUL_TIMEOUT,
+        "keepalive": SERVER_KEEPALIVE,
+        # Recycle workers to cap memory growth from pandas/llama_index; jitter avoids restarting all at once.
+        "max_requests": SERVER_MAX_REQUESTS,
+        "max_requests_jitter": SERVER_MAX_REQUESTS_JITTER,
+        "pidfile": SERVER_PIDFILE,
+        "post_fork": post_fork,
+    }
+
+if __name__ == "__main__":
+    warn_about_cache()
+    Server(app, server_options()).run()
@@ -0,0 +1,154 @@
+import multiprocessing
+
+import pytest
+
+cache = pytest.importorskip("app.services.cache")
+flask = pytest.importorskip("flask")
+
+from sqlalchemy import Column, ForeignKey, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+
+def bump_in_child(backend, namespace):
+    backend.bump(namespace)
+
+
+def test_lru_backend_evicts_least_recently_used():
+    backend = cache.LRUBackend(max_entries=2, ttl=60)
+    backend.set("a", b"1")
+    backend.set("b", b"2")
+    backend.get("a")
+    backend.set("c", b"3")
+
+    assert backend.get("a") == b"1"
+    assert backend.get("b") is None
+    assert backend.get("c") == b"3"
+
+
+def test_lru_backend_expires_entries():
+    backend = cache.LRUBackend(max_entries=2, ttl=-1)
+    backend.set("a", b"1")
+
+    assert backend.get("a") is None
+
+
+def test_lru_backend_generation_bumps_are_seen_across_forked_workers():
+    backend = cache.LRUBackend(max_entries=2, ttl=60)
+    before = backend.generation("files")
+
+    worker = multiprocessing.get_context("fork").Process(target=bump_in_child, args=(backend, "files"))
+    worker.start()
+    worker.join(10)
+
+    assert worker.exitcode == 0
+    assert backend.generation("files") == before + 1
+
+
+Base = declarative_base()
+
+
+class CachedUser(Base):
+    __tablename__ = "cached_users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(255))
+
+
+class CachedFile(Base):
+    __tablename__ = "cached_files"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("cached_users.id"))
+
+
+class FailingBackend:
+    def __getattr__(self, name):
+        def fail(*args):
+            raise ConnectionError("cache backend is down")
+        return fail
+
+
+@pytest.fixture
+def setup():
+    response_cache = cache.ResponseCache(max_entries=16, ttl=60)
+    response_cache.watch(CachedUser, "users")
+    response_cache.watch(CachedFile, "files")
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    session.add(CachedUser(id=1, name="Ann"))
+    session.commit()
+
+    app = flask.Flask(__name__)
+    calls = {"users": 0, "all_files": 0}
+
+    @app.route("/users")
+    @response_cache.cached("users")
+    def users():
+        calls["users"] += 1
+        return flask.jsonify({"names": [user.name for user in session.query(CachedUser)]})
+
+    @app.route("/all-files")
+    @response_cache.cached("files", "users")
+    def all_files():
+        calls["all_files"] += 1
+        return flask.jsonify({"count": session.query(CachedFile).count()})
+
+    yield response_cache, session, app.test_client(), calls
+    session.close()
+
+
+def test_cached_serves_hits_until_a_commit_invalidates(setup):
+    response_cache, session, client, calls = setup
+
+    assert client.get("/users").get_json() == {"names": ["Ann"]}
+    assert client.get("/users").get_json() == {"names": ["Ann"]}
+    assert calls["users"] == 1
+
+    session.get(CachedUser, 1).name = "Bea"
+    session.commit()
+
+    assert client.get("/users").get_json() == {"names": ["Bea"]}
+    assert calls["users"] == 2
+    assert response_cache.stats()["worker"]["endpoints"]["users"] == {"hits": 1, "misses": 2, "hit_ratio": 0.3333}
+
+
+def test_rollback_keeps_cached_entries(setup):
+    response_cache, session, client, calls = setup
+
+    client.get("/users")
+    session.add(CachedUser(id=2, name="Cal"))
+    session.flush()
+    session.rollback()
+
+    assert client.get("/users").get_json() == {"names": ["Ann"]}
+    assert calls["users"] == 1
+
+
+def test_user_change_invalidates_listing_of_all_files(setup):
+    response_cache, session, client, calls = setup
+
+    client.get("/all-files")
+    client.get("/all-files")
+    assert calls["all_files"] == 1
+
+    session.get(CachedUser, 1).name = "Bea"
+    session.commit()
+
+    client.get("/all-files")
+    assert calls["all_files"] == 2
+
+
+def test_backend_outage_serves_uncached_and_keeps_commits_quiet(setup):
+    response_cache, session, client, calls = setup
+    response_cache.backend = FailingBackend()
+
+    assert client.get("/users").status_code == 200
+    assert client.get("/users").status_code == 200
+    assert calls["users"] == 2
+
+    session.get(CachedUser, 1).name = "Bea"
+    session.commit()
+
+    assert session.get(CachedUser, 1).name == "Bea"
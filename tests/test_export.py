@@ -0,0 +1,25 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+export = pytest.importorskip("app.api.export")
+app_module = pytest.importorskip("app")
+
+FIELDS = ("id", "created_at")
+ROWS = [(1, datetime(2026, 10, 19, 12, 55, 50, 879087)), (2, None)]
+
+
+def test_csv_and_ndjson_exports_use_the_same_datetime_format():
+    with app_module.app.app_context():
+        ndjson = "".join(export.iter_ndjson(FIELDS, ROWS))
+    csv_text = "".join(export.iter_csv(FIELDS, ROWS))
+
+    ndjson_rows = [json.loads(line) for line in ndjson.splitlines()]
+    csv_rows = list(csv.DictReader(io.StringIO(csv_text)))
+
+    assert ndjson_rows[0]["created_at"] == "2026-10-19T12:55:50.879087"
+    assert csv_rows[0]["created_at"] == ndjson_rows[0]["created_at"]
+    assert csv_rows[1]["created_at"] == ""
@@ -0,0 +1,28 @@
+import io
+
+import pytest
+
+app_module = pytest.importorskip("app")
+
+SCAN_ENDPOINTS = ["/api/v1/file/scan", "/api/v1/file/scan/stream"]
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+@pytest.mark.parametrize("endpoint", SCAN_ENDPOINTS)
+def test_scan_requires_files(client, endpoint):
+    response = client.post(endpoint, data={"userId": "1"})
+
+    assert response.status_code == 400
+    assert response.get_json() == {"msg": "No files part in the request"}
+
+
+@pytest.mark.parametrize("endpoint", SCAN_ENDPOINTS)
+def test_scan_requires_user(client, endpoint):
+    response = client.post(endpoint, data={"files": (io.BytesIO(b"%PDF-1.4"), "invoice.pdf")})
+
+    assert response.status_code == 401
+    assert response.get_json() == {"msg": "UnAuthorized request"}
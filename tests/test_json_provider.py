@@ -0,0 +1,38 @@
+from datetime import date, datetime
+
+import pytest
+
+pytest.importorskip("orjson")
+flask = pytest.importorskip("flask")
+json_provider = pytest.importorskip("app.services.json_provider")
+
+PAYLOAD = {
+    "created_at": datetime(2024, 12, 1, 19, 57, 50),
+    "updated_at": datetime(2024, 12, 1, 19, 57, 50, 123456),
+    "day": date(2024, 12, 1),
+}
+
+
+def make_app(provider):
+    app = flask.Flask(__name__)
+    json_provider.init_json_provider(app, provider)
+    return app
+
+
+@pytest.mark.parametrize("provider", ["orjson", "default"])
+def test_datetimes_are_iso_8601_for_every_provider(provider):
+    app = make_app(provider)
+
+    with app.app_context():
+        body = app.json.response(PAYLOAD).get_json()
+
+    assert body == {
+        "created_at": "2024-12-01T19:57:50",
+        "updated_at": "2024-12-01T19:57:50.123456",
+        "day": "2024-12-01",
+    }
+
+
+def test_orjson_and_fallback_providers_agree():
+    assert make_app("orjson").json.loads(make_app("orjson").json.dumps(PAYLOAD)) == \
+        make_app("default").json.loads(make_app("default").json.dumps(PAYLOAD))
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+scan = pytest.importorskip("app.services.scan")
+
+
+def test_page_ranges_without_chunking_covers_whole_document():
+    assert scan.page_ranges(7, 0) == [(1, 7)]
+    assert scan.page_ranges(7, None) == [(1, 7)]
+    assert scan.page_ranges(7, -3) == [(1, 7)]
+
+
+def test_page_ranges_document_not_longer_than_chunk():
+    assert scan.page_ranges(5, 5) == [(1, 5)]
+    assert scan.page_ranges(3, 10) == [(1, 3)]
+
+
+def test_page_ranges_splits_with_short_last_range():
+    assert scan.page_ranges(10, 4) == [(1, 4), (5, 8), (9, 10)]
+
+
+def test_page_ranges_exact_multiple():
+    assert scan.page_ranges(9, 3) == [(1, 3), (4, 6), (7, 9)]
+
+
+def test_page_ranges_single_page_chunks():
+    assert scan.page_ranges(3, 1) == [(1, 1), (2, 2), (3, 3)]
+
+
+def test_drop_repeated_headers_removes_header_and_separator_rows():
+    table = pd.DataFrame(
+        [
+            [" Product ", "10"],
+            [" Product", " Amount "],
+            ["---", "---"],
+            [":--", "--:"],
+            ["Cheese", "4"],
+        ],
+        columns=["Product", "Amount"],
+    )
+
+    result = scan.drop_repeated_headers(table)
+
+    assert result.values.tolist() == [[" Product ", "10"], ["Cheese", "4"]]
+    assert list(result.index) == [0, 1]
+
+
+def test_drop_repeated_headers_keeps_dash_placeholder_rows():
+    table = pd.DataFrame([["-", "-"], ["-", ""], ["Milk", "-"]], columns=["Product", "Amount"])
+
+    result = scan.drop_repeated_headers(table)
+
+    assert result.values.tolist() == [["-", "-"], ["-", ""], ["Milk", "-"]]
+
+
+def test_drop_repeated_headers_keeps_empty_rows_and_handles_missing_cells():
+    table = pd.DataFrame([["", ""], ["Bread", None]], columns=["Product", "Amount"])
+
+    result = scan.drop_repeated_headers(table)
+
+    assert len(result) == 2
+
+
+def test_merge_tables_keeps_page_order_and_drops_repeated_headers():
+    first = pd.DataFrame([["A", "1"]], columns=["Product", "Amount"])
+    second = pd.DataFrame([["Product", "Amount"], ["B", "2"]], columns=["Product", "Amount"])
+
+    result = scan.merge_tables([first, second])
+
+    assert result.values.tolist() == [["A", "1"], ["B", "2"]]
+
+
+def test_iter_scan_fails_fast_and_cancels_other_ranges(monkeypatch):
+    started = []
+    release = threading.Event()
+
+    def fake_extract_range(pdf_path, start, end, retries=0, emit=None, cancelled=None):
+        started.append(start)
+        if start == 3:
+            raise scan.PageRangeError(start, end, RuntimeError("boom"))
+        cancelled.wait(5)
+        release.set()
+        return []
+
+    monkeypatch.setattr(scan, "split_pdf", lambda pdf_path, ranges, output_dir: [pdf_path] * len(ranges))
+    monkeypatch.setattr(scan, "extract_range", fake_extract_range)
+
+    began = time.monotonic()
+    with pytest.raises(scan.PageRangeError):
+        list(scan.iter_scan("invoice.pdf", 8, chunk_size=2, max_workers=2))
+
+    assert time.monotonic() - began < 2
+    assert release.wait(2)
+    # The last range was still queued behind the two workers and never started.
+    assert 7 not in started